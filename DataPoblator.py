@@ -1,13 +1,19 @@
 import json
-import boto3
+import asyncio
+import aioboto3
+import orjson
 import os
 from dotenv import load_dotenv
-from botocore.exceptions import ClientError
-import time
+from boto3.dynamodb.types import TypeSerializer
+from botocore.config import Config
+from botocore.exceptions import (
+    BotoCoreError, ClientError, ConnectionClosedError, ConnectTimeoutError,
+    EndpointConnectionError, ReadTimeoutError
+)
 from decimal import Decimal
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
-import random as random_module
+from itertools import islice
+from pathlib import Path
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_delay, wait_random_exponential
 
 # Cargar variables de entorno desde .env (si existe)
 load_dotenv()
@@ -17,8 +23,62 @@ load_dotenv()
 # Solo necesitamos especificar la región
 AWS_REGION = os.getenv('AWS_REGION', 'us-east-1')
 
-dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
-dynamodb_client = boto3.client('dynamodb', region_name=AWS_REGION)
+# Sesión única (asíncrona) para todo el script: comparte la resolución de
+# credenciales y de endpoints. Los clientes/recursos se abren con `async with` en main()
+SESSION = aioboto3.Session(region_name=AWS_REGION)
+
+# Número máximo de lotes de escritura en vuelo al mismo tiempo (por tabla)
+MAX_CONCURRENT_BATCHES = 64
+
+# Control adaptativo de concurrencia (AIMD): se reduce a la mitad ante throttling
+# (hasta el mínimo) y crece de a poco tras una racha de lotes sin throttling
+MIN_CONCURRENT_BATCHES = 4
+CONCURRENCY_INCREASE_STEP = 4
+CONCURRENCY_SUCCESS_STREAK = 50
+
+# Errores de throttling: se reintentan con backoff y reducen la concurrencia
+THROTTLING_ERROR_CODES = {
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+}
+
+# Errores transitorios del servicio (5xx): se reintentan con backoff
+SERVER_ERROR_CODES = {
+    'InternalServerError',
+    'InternalFailure',
+    'ServiceUnavailable',
+}
+
+# Errores de red transitorios de botocore que también se reintentan
+TRANSIENT_BOTOCORE_ERRORS = (
+    ConnectionClosedError,
+    ConnectTimeoutError,
+    EndpointConnectionError,
+    ReadTimeoutError,
+)
+
+# Tamaño máximo de un item en DynamoDB. Con 25 items por lote, el límite de 16 MB
+# por BatchWriteItem no se alcanza si cada item respeta este máximo
+MAX_ITEM_SIZE_BYTES = 400 * 1024
+
+# Cada cuántos segundos se imprime el progreso de escritura
+PROGRESS_INTERVAL_SECONDS = 1
+
+# Backoff de las escrituras: la espera (con jitter) parte de ~RETRY_BASE_SECONDS,
+# se duplica en cada intento hasta RETRY_MAX_WAIT_SECONDS y se deja de reintentar
+# tras RETRY_MAX_DELAY_SECONDS en total
+RETRY_BASE_SECONDS = 1
+RETRY_MAX_WAIT_SECONDS = 30
+RETRY_MAX_DELAY_SECONDS = 120
+
+# Segmentos del scan paralelo usado al vaciar tablas
+SCAN_TOTAL_SEGMENTS = 8
+
+# Serializador único (y su método ya resuelto) para convertir items Python al
+# formato AttributeValue de DynamoDB
+_SERIALIZER = TypeSerializer()
+_SERIALIZE = _SERIALIZER.serialize
 
 # Nombres de las tablas DynamoDB
 TABLE_LOCALES = os.getenv('TABLE_LOCALES')
@@ -34,47 +94,56 @@ TABLE_TOKENS = os.getenv('TABLE_TOKENS')
 # Carpeta con los datos JSON
 DATA_DIR = "dynamodb_data"
 
-# Mapeo de archivos JSON a tablas y sus claves
+# Mapeo de archivos JSON a tablas, sus claves y los campos numéricos no enteros
+# (según schemas-validation/) que deben guardarse como Decimal
 TABLE_MAPPING = {
     "locales.json": {
         "table_name": TABLE_LOCALES,
         "pk": "local_id",
-        "sk": None
+        "sk": None,
+        "decimal_fields": []
     },
     "usuarios.json": {
         "table_name": TABLE_USUARIOS,
         "pk": "correo",
-        "sk": None
+        "sk": None,
+        "decimal_fields": []
     },
     "productos.json": {
         "table_name": TABLE_PRODUCTOS,
         "pk": "local_id",
-        "sk": "nombre"
+        "sk": "nombre",
+        "decimal_fields": ["precio"]
     },
     "empleados.json": {
         "table_name": TABLE_EMPLEADOS,
         "pk": "local_id",
-        "sk": "dni"
+        "sk": "dni",
+        "decimal_fields": ["calificacion_prom", "sueldo"]
     },
     "combos.json": {
         "table_name": TABLE_COMBOS,
         "pk": "local_id",
-        "sk": "combo_id"
+        "sk": "combo_id",
+        "decimal_fields": []
     },
     "pedidos.json": {
         "table_name": TABLE_PEDIDOS,
         "pk": "local_id",
-        "sk": "pedido_id"
+        "sk": "pedido_id",
+        "decimal_fields": ["costo"]
     },
     "ofertas.json": {
         "table_name": TABLE_OFERTAS,
         "pk": "local_id",
-        "sk": "oferta_id"
+        "sk": "oferta_id",
+        "decimal_fields": ["porcentaje_descuento"]
     },
     "resenas.json": {
         "table_name": TABLE_RESENAS,
         "pk": "pk",  # Partition key compuesta: LOCAL#<local_id>#EMP#<empleado_dni>
-        "sk": "resena_id"
+        "sk": "resena_id",
+        "decimal_fields": ["calificacion"]
     }
 }
 TABLE_TOKENS_CONFIG = {
@@ -84,18 +153,61 @@ TABLE_TOKENS_CONFIG = {
 }
 
 
-def convert_float_to_decimal(obj):
+# Todas las tablas se pueblan a la vez, así que los pools de conexiones se
+# dimensionan para el total de peticiones en vuelo de todas ellas
+
+# Configuración del recurso y del cliente de lectura/administración (scan,
+# describe, list_tables, create/delete_table): conservan los reintentos de botocore.
+# En vuelo: hasta SCAN_TOTAL_SEGMENTS scans por tabla
+BOTO_CONFIG = Config(
+    max_pool_connections=SCAN_TOTAL_SEGMENTS * len(TABLE_MAPPING),
+    retries={'mode': 'standard'},
+    tcp_keepalive=True
+)
+
+# Configuración del cliente de escritura (BatchWriteItem): sin reintentos de
+# botocore, ya que send_write_requests tiene su propio backoff.
+# En vuelo: hasta MAX_CONCURRENT_BATCHES lotes por tabla
+WRITE_BOTO_CONFIG = Config(
+    max_pool_connections=MAX_CONCURRENT_BATCHES * len(TABLE_MAPPING),
+    retries={'mode': 'standard', 'total_max_attempts': 1},
+    tcp_keepalive=True
+)
+
+
+class UnprocessedItemsError(Exception):
+    """BatchWriteItem devolvió items sin procesar (se reintentan con backoff)"""
+
+
+def is_throttling_error(exception):
+    """Indica si un error de escritura es señal de congestión (throttling o items no procesados)"""
+    if isinstance(exception, UnprocessedItemsError):
+        return True
+    return isinstance(exception, ClientError) and exception.response['Error']['Code'] in THROTTLING_ERROR_CODES
+
+
+def is_retryable_error(exception):
+    """Indica si un error de escritura debe reintentarse (congestión, 5xx o red transitoria)"""
+    if is_throttling_error(exception) or isinstance(exception, TRANSIENT_BOTOCORE_ERRORS):
+        return True
+    if isinstance(exception, ClientError):
+        error = exception.response.get('Error', {})
+        status = exception.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+        return error.get('Code') in SERVER_ERROR_CODES or status >= 500
+    return False
+
+
+def backoff_retrying(max_delay=RETRY_MAX_DELAY_SECONDS):
     """
-    Convierte float a Decimal recursivamente para compatibilidad con DynamoDB
+    Política de reintentos compartida: backoff exponencial con jitter que espera
+    con asyncio.sleep, sin bloquear el event loop
     """
-    if isinstance(obj, list):
-        return [convert_float_to_decimal(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {key: convert_float_to_decimal(value) for key, value in obj.items()}
-    elif isinstance(obj, float):
-        return Decimal(str(obj))
-    else:
-        return obj
+    return AsyncRetrying(
+        stop=stop_after_delay(max_delay),
+        wait=wait_random_exponential(multiplier=RETRY_BASE_SECONDS, max=RETRY_MAX_WAIT_SECONDS),
+        retry=retry_if_exception(is_retryable_error),
+        reraise=True
+    )
 
 
 def get_table_keys(filename):
@@ -106,22 +218,19 @@ def get_table_keys(filename):
     return None, None
 
 
-def get_dynamodb_client():
+async def list_existing_tables(dynamodb_client):
     """
-    Crea y retorna un cliente de DynamoDB usando credenciales de ~/.aws/credentials
+    Retorna el conjunto de nombres de tablas existentes en DynamoDB (o None si falla).
+    ListTables devuelve hasta 100 nombres por página, así que basta con muy pocas llamadas
+    en lugar de un describe_table por tabla.
+    Es la primera llamada a AWS, por lo que también detecta credenciales inválidas.
     """
     try:
-        # boto3 automáticamente busca credenciales en:
-        # 1. Variables de entorno
-        # 2. ~/.aws/credentials
-        # 3. ~/.aws/config
-        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
-        
-        # Verificar conexión intentando listar tablas
-        client = boto3.client('dynamodb', region_name=AWS_REGION)
-        client.list_tables(Limit=1)
-        
-        return dynamodb
+        existing_tables = set()
+        paginator = dynamodb_client.get_paginator('list_tables')
+        async for page in paginator.paginate():
+            existing_tables.update(page['TableNames'])
+        return existing_tables
     except ClientError as e:
         error_code = e.response['Error']['Code']
         if error_code == 'UnrecognizedClientException':
@@ -134,19 +243,7 @@ def get_dynamodb_client():
         return None
 
 
-def table_exists(table_name):
-    """Verifica si una tabla existe en DynamoDB"""
-    try:
-        dynamodb_client.describe_table(TableName=table_name)
-        return True
-    except ClientError as e:
-        if e.response['Error']['Code'] == 'ResourceNotFoundException':
-            return False
-        else:
-            raise
-
-
-def create_table(table_name, pk_name, sk_name=None):
+async def create_table(dynamodb, table_name, pk_name, sk_name=None):
     """Crea una tabla en DynamoDB con las claves especificadas"""
     print(f"   📋 Tabla '{table_name}' no existe. Creándola...")
     
@@ -158,18 +255,26 @@ def create_table(table_name, pk_name, sk_name=None):
         key_schema.append({'AttributeName': sk_name, 'KeyType': 'RANGE'})
         attribute_definitions.append({'AttributeName': sk_name, 'AttributeType': 'S'})
     
+    table_config = {
+        'TableName': table_name,
+        'KeySchema': key_schema,
+        'AttributeDefinitions': attribute_definitions,
+        'BillingMode': 'PAY_PER_REQUEST'  # On-demand pricing (sin necesidad de configurar capacidad)
+    }
+    
+    return await create_table_from_config(dynamodb, table_config)
+
+
+async def create_table_from_config(dynamodb, table_config):
+    """Crea una tabla con los parámetros de CreateTable indicados y espera a que esté activa"""
+    table_name = table_config['TableName']
+    
     try:
-        table_config = {
-            'TableName': table_name,
-            'KeySchema': key_schema,
-            'AttributeDefinitions': attribute_definitions,
-            'BillingMode': 'PAY_PER_REQUEST'  # On-demand pricing (sin necesidad de configurar capacidad)
-        }
-        
-        table = dynamodb.create_table(**table_config)
+        await dynamodb.create_table(**table_config)
         
         print(f"   ⏳ Esperando a que la tabla '{table_name}' esté activa...")
-        table.wait_until_exists()
+        waiter = dynamodb.meta.client.get_waiter('table_exists')
+        await waiter.wait(TableName=table_name)
         
         print(f"   ✅ Tabla '{table_name}' creada exitosamente")
         return True
@@ -177,57 +282,236 @@ def create_table(table_name, pk_name, sk_name=None):
     except ClientError as e:
         print(f"   ❌ Error al crear tabla '{table_name}': {e.response['Error']['Message']}")
         return False
+    except BotoCoreError as e:
+        # p. ej. WaiterError si la tabla no llega a estar activa
+        print(f"   ❌ Error al crear tabla '{table_name}': {e}")
+        return False
+
+
+def convert_decimal_fields(items, decimal_fields):
+    """
+    Convierte a Decimal (compatible con DynamoDB) solo los campos numéricos indicados,
+    en lugar de recorrer todo el árbol de cada item
+    """
+    for item in items:
+        for field in decimal_fields:
+            value = item.get(field)
+            if isinstance(value, float):
+                item[field] = Decimal(str(value))
 
 
-def load_json_file(filename):
+def load_json_file(filename, decimal_fields=()):
     """
-    Carga un archivo JSON y retorna su contenido
+    Carga un archivo JSON con orjson y retorna su contenido
     """
     filepath = os.path.join(DATA_DIR, filename)
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # Convertir floats a Decimal
-            return convert_float_to_decimal(data)
+        data = orjson.loads(Path(filepath).read_bytes())
     except FileNotFoundError:
         print(f"⚠️  Archivo no encontrado: {filepath}")
         return None
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"⚠️  Error al decodificar JSON en {filename}: {e}")
         return None
+    
+    if isinstance(data, list):
+        convert_decimal_fields(data, decimal_fields)
+    return data
+
+
+def get_data_file_size(filename):
+    """Tamaño en bytes del archivo JSON (0 si no existe), usado para ordenar las tablas"""
+    filepath = os.path.join(DATA_DIR, filename)
+    return os.path.getsize(filepath) if os.path.isfile(filepath) else 0
+
+
+def dedupe_items(items, pk_name, sk_name=None):
+    """
+    Descarta items con la misma clave (PK, SK); gana el último, como en DynamoDB.
+    Evita que un lote de BatchWriteItem falle completo por claves repetidas.
+    Los items sin PK (o sin SK, si la tabla la tiene) se descartan aparte como
+    inválidos, en lugar de agruparse bajo una clave vacía.
+    Retorna la lista de items únicos, la cantidad de duplicados y la de inválidos.
+    """
+    unique_items = {}
+    total = 0
+    invalid = 0
+    for item in items:
+        pk = item.get(pk_name) if isinstance(item, dict) else None
+        sk = item.get(sk_name) if sk_name and isinstance(item, dict) else None
+        if pk is None or (sk_name and sk is None):
+            invalid += 1
+            continue
+        unique_items[(pk, sk)] = item
+        total += 1
+    return list(unique_items.values()), total - len(unique_items), invalid
+
+
+async def get_dependent_state(dynamodb, table_description):
+    """
+    Retorna la configuración de la tabla que DeleteTable + CreateTable no conservaría
+    (lista vacía si se puede recrear sin perder nada)
+    """
+    table_name = table_description['TableName']
+    client = dynamodb.meta.client
+    dependent_state = []
+    
+    if table_description.get('GlobalSecondaryIndexes') or table_description.get('LocalSecondaryIndexes'):
+        dependent_state.append('índices secundarios')
+    if table_description.get('StreamSpecification', {}).get('StreamEnabled'):
+        dependent_state.append('stream')
+    if table_description.get('DeletionProtectionEnabled'):
+        dependent_state.append('protección contra borrado')
+    # Sin BillingModeSummary la tabla es provisionada: su capacidad y autoscaling
+    # no se reproducen al recrearla
+    if table_description.get('BillingModeSummary', {}).get('BillingMode', 'PROVISIONED') != 'PAY_PER_REQUEST':
+        dependent_state.append('capacidad provisionada')
+    
+    ttl = await client.describe_time_to_live(TableName=table_name)
+    if ttl['TimeToLiveDescription'].get('TimeToLiveStatus') in ('ENABLED', 'ENABLING'):
+        dependent_state.append('TTL')
+    
+    backups = await client.describe_continuous_backups(TableName=table_name)
+    pitr = backups['ContinuousBackupsDescription'].get('PointInTimeRecoveryDescription', {})
+    if pitr.get('PointInTimeRecoveryStatus') == 'ENABLED':
+        dependent_state.append('PITR')
+    
+    return dependent_state
+
+
+async def get_table_tags(dynamodb, table_arn):
+    """Obtiene todos los tags de una tabla (con paginación)"""
+    tags = []
+    kwargs = {'ResourceArn': table_arn}
+    while True:
+        response = await dynamodb.meta.client.list_tags_of_resource(**kwargs)
+        tags.extend(response.get('Tags', []))
+        if 'NextToken' not in response:
+            return tags
+        kwargs['NextToken'] = response['NextToken']
+
+
+def build_table_config(table_description, tags=None):
+    """
+    Arma los parámetros de CreateTable que reproducen una tabla existente:
+    claves, cifrado, clase de tabla y tags.
+    Solo se recrean tablas on-demand (las provisionadas se vacían con scan-delete,
+    ver get_dependent_state), así que la facturación es siempre PAY_PER_REQUEST.
+    """
+    table_config = {
+        'TableName': table_description['TableName'],
+        'KeySchema': table_description['KeySchema'],
+        'AttributeDefinitions': table_description['AttributeDefinitions'],
+        'BillingMode': 'PAY_PER_REQUEST'
+    }
+    
+    sse = table_description.get('SSEDescription', {})
+    if sse.get('Status') in ('ENABLED', 'ENABLING'):
+        sse_specification = {'Enabled': True}
+        if sse.get('SSEType'):
+            sse_specification['SSEType'] = sse['SSEType']
+        if sse.get('KMSMasterKeyArn'):
+            sse_specification['KMSMasterKeyId'] = sse['KMSMasterKeyArn']
+        table_config['SSESpecification'] = sse_specification
+    
+    table_class = table_description.get('TableClassSummary', {}).get('TableClass')
+    if table_class:
+        table_config['TableClass'] = table_class
+    
+    if tags:
+        table_config['Tags'] = tags
+    
+    return table_config
+
+
+async def recreate_table(dynamodb, table_description, tags=None):
+    """
+    Vacía una tabla eliminándola y creándola de nuevo (DeleteTable + CreateTable)
+    con la misma configuración de su describe_table y sus tags.
+    Son operaciones de metadatos: no consumen RCU/WCU sin importar el tamaño.
+    """
+    table_name = table_description['TableName']
+    
+    try:
+        print(f"   ♻️  Recreando tabla '{table_name}'...")
+        table_config = build_table_config(table_description, tags)
+        
+        await dynamodb.meta.client.delete_table(TableName=table_name)
+        
+        waiter = dynamodb.meta.client.get_waiter('table_not_exists')
+        await waiter.wait(TableName=table_name)
+    except ClientError as e:
+        print(f"   ❌ Error al eliminar tabla '{table_name}': {e.response['Error']['Message']}")
+        return False
+    except BotoCoreError as e:
+        # p. ej. WaiterError si la tabla no termina de eliminarse
+        print(f"   ❌ Error al eliminar tabla '{table_name}': {e}")
+        return False
+    
+    return await create_table_from_config(dynamodb, table_config)
 
 
-def delete_all_items_from_table(table_name, pk_name, sk_name=None):
+async def scan_segment(dynamodb_client, table_name, key_names, segment, total_segments):
+    """
+    Escanea (con paginación) un segmento del scan paralelo, trayendo solo las claves.
+    El cliente de bajo nivel las retorna ya en formato AttributeValue.
+    """
+    scan_kwargs = {
+        'TableName': table_name,
+        'Segment': segment,
+        'TotalSegments': total_segments,
+        'ProjectionExpression': ', '.join(f'#k{i}' for i in range(len(key_names))),
+        'ExpressionAttributeNames': {f'#k{i}': key for i, key in enumerate(key_names)}
+    }
+    
+    response = await dynamodb_client.scan(**scan_kwargs)
+    keys = response.get('Items', [])
+    
+    while 'LastEvaluatedKey' in response:
+        response = await dynamodb_client.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_kwargs)
+        keys.extend(response.get('Items', []))
+    
+    return keys
+
+
+async def delete_all_items_from_table(dynamodb_client, write_client, table_name, pk_name, sk_name=None):
     """Elimina todos los items de una tabla de DynamoDB"""
     try:
-        table = dynamodb.Table(table_name)
+        key_names = [pk_name] + ([sk_name] if sk_name else [])
         
         print(f"   🗑️  Escaneando items en '{table_name}'...")
         
-        # Escanear todos los items
-        response = table.scan()
-        items = response.get('Items', [])
-        
-        # Manejar paginación
-        while 'LastEvaluatedKey' in response:
-            response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-            items.extend(response.get('Items', []))
+        # Escanear todas las claves con un scan paralelo: cada segmento pagina por su cuenta
+        segments = await asyncio.gather(*[
+            scan_segment(dynamodb_client, table_name, key_names, segment, SCAN_TOTAL_SEGMENTS)
+            for segment in range(SCAN_TOTAL_SEGMENTS)
+        ])
+        keys = [key for segment_keys in segments for key in segment_keys]
         
-        if not items:
+        if not keys:
             print(f"   ℹ️  La tabla '{table_name}' ya está vacía")
             return True
         
-        print(f"   🗑️  Eliminando {len(items)} items de '{table_name}'...")
+        print(f"   🗑️  Eliminando {len(keys)} items de '{table_name}'...")
         
-        # Eliminar en lotes
-        with table.batch_writer() as batch:
-            for item in items:
-                key = {pk_name: item[pk_name]}
-                if sk_name:
-                    key[sk_name] = item[sk_name]
-                batch.delete_item(Key=key)
+        # Eliminar en lotes de 25 concurrentes con el mismo camino de BatchWriteItem que las escrituras
+        sem = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
         
-        print(f"   ✅ {len(items)} items eliminados de '{table_name}'")
+        async def delete_batch(batch_keys):
+            async with sem:
+                requests = [{'DeleteRequest': {'Key': key}} for key in batch_keys]
+                pending, _ = await send_write_requests(write_client, table_name, requests)
+                return pending
+        
+        pending = sum(await asyncio.gather(*[
+            delete_batch(keys[i:i + 25]) for i in range(0, len(keys), 25)
+        ]))
+        
+        if pending > 0:
+            print(f"   ❌ No se pudieron eliminar {pending} items de '{table_name}'")
+            return False
+        
+        print(f"   ✅ {len(keys)} items eliminados de '{table_name}'")
         return True
         
     except ClientError as e:
@@ -243,96 +527,181 @@ def delete_all_items_from_table(table_name, pk_name, sk_name=None):
         return False
 
 
-def batch_write_items(table, items, table_name):
-    """Escribe items en lotes a DynamoDB con procesamiento paralelo y retry"""
+def estimate_item_size(item):
+    """Estimación barata (en bytes) del tamaño de un item, a partir de su JSON"""
+    return len(json.dumps(item, default=str).encode())
+
+
+def serialize_item(item):
+    """
+    Convierte un item Python al formato AttributeValue que espera el cliente de bajo nivel.
+    Si un valor no se puede serializar (p. ej. un float fuera de decimal_fields),
+    lanza TypeError indicando el campo.
+    """
+    try:
+        return {key: _SERIALIZE(value) for key, value in item.items()}
+    except TypeError as e:
+        for key, value in item.items():
+            try:
+                _SERIALIZE(value)
+            except TypeError:
+                raise TypeError(f"campo '{key}': {e}") from e
+        raise
+
+
+async def send_write_requests(write_client, table_name, requests, on_throttle=None, max_delay=RETRY_MAX_DELAY_SECONDS):
+    """
+    Envía hasta 25 WriteRequests ya serializados (PutRequest/DeleteRequest) con
+    BatchWriteItem y reintenta solo los UnprocessedItems con backoff exponencial.
+    Retorna (requests_pendientes, hubo_throttling).
+    """
+    request_items = {table_name: requests}
+    throttled = False
+    
+    try:
+        async for attempt in backoff_retrying(max_delay):
+            with attempt:
+                try:
+                    response = await write_client.batch_write_item(RequestItems=request_items)
+                    # DynamoDB reporta fallos parciales como items no procesados
+                    request_items = response.get('UnprocessedItems', {})
+                    if request_items:
+                        raise UnprocessedItemsError()
+                except Exception as e:
+                    # Items no procesados o error de throttling: avisar (p. ej. para bajar la concurrencia)
+                    if is_throttling_error(e) and not throttled:
+                        throttled = True
+                        if on_throttle:
+                            on_throttle()
+                    raise
+        
+        return 0, throttled
+    
+    except UnprocessedItemsError:
+        # Se agotaron los reintentos con items pendientes
+        pass
+    except (ClientError, BotoCoreError) as e:
+        if not is_throttling_error(e):
+            # Otro tipo de error (o 5xx/red tras agotar reintentos): lo pendiente se cuenta como error
+            print(f"      ⚠️  Error en lote de '{table_name}': {str(e)[:80]}")
+    
+    return len(request_items.get(table_name, [])), throttled
+
+
+async def batch_write_items(write_client, items, table_name, total_items):
+    """
+    Escribe items (cualquier iterable, con total_items elementos) en lotes a
+    DynamoDB con escrituras asíncronas concurrentes y retry.
+    Usa el cliente de bajo nivel con items ya serializados, sin pasar por la capa de recursos.
+    La cantidad de lotes en vuelo se ajusta según el throttling (AIMD).
+    """
     success_count = 0
     error_count = 0
-    total_items = len(items)
     
     # Tamaño del lote (máximo 25 en DynamoDB)
     batch_size = 25
     
-    # Lock para actualizar contadores de forma segura entre threads
-    count_lock = Lock()
+    # Lotes en vuelo permitidos actualmente (un solo event loop, sin threads)
+    current_concurrency = MAX_CONCURRENT_BATCHES
+    success_streak = 0
+    # Cuántas veces se ha reducido la concurrencia; cada lote recuerda el valor con
+    # el que se lanzó para reducir una sola vez por episodio de congestión
+    decrease_epoch = 0
     
-    # Dividir items en lotes
-    batches = [items[i:i + batch_size] for i in range(0, total_items, batch_size)]
+    def register_throttle(launch_epoch):
+        """
+        Reduce a la mitad la concurrencia cuando DynamoDB aplica throttling. Los lotes
+        lanzados antes de la última reducción ya fueron contemplados por ella y no
+        vuelven a reducirla.
+        """
+        nonlocal current_concurrency, success_streak, decrease_epoch
+        if launch_epoch < decrease_epoch:
+            return
+        current_concurrency = max(MIN_CONCURRENT_BATCHES, current_concurrency // 2)
+        success_streak = 0
+        decrease_epoch += 1
     
-    def process_batch_with_retry(batch, max_retries=5):
-        """Procesa un lote de items con retry y backoff exponencial"""
-        local_success = 0
-        local_errors = 0
+    def register_success():
+        """Aumenta la concurrencia tras una racha de lotes sin throttling"""
+        nonlocal current_concurrency, success_streak
+        success_streak += 1
+        if success_streak > CONCURRENCY_SUCCESS_STREAK:
+            current_concurrency = min(MAX_CONCURRENT_BATCHES, current_concurrency + CONCURRENCY_INCREASE_STEP)
+            success_streak = 0
+    
+    async def _write_batch(batch, launch_epoch):
+        """Escribe un lote y actualiza el progreso y el control de concurrencia"""
+        nonlocal success_count, error_count
         
-        for attempt in range(max_retries):
-            try:
-                with table.batch_writer() as batch_writer:
-                    for item in batch:
-                        try:
-                            batch_writer.put_item(Item=item)
-                            local_success += 1
-                        except ClientError as e:
-                            if e.response['Error']['Code'] == 'ProvisionedThroughputExceededException':
-                                # No contar como error aún, se reintentará
-                                raise
-                            else:
-                                local_errors += 1
-                                if local_errors <= 2:
-                                    print(f"      ⚠️  Error al insertar item: {str(e)[:80]}")
-                        except Exception as e:
-                            local_errors += 1
-                            if local_errors <= 2:
-                                print(f"      ⚠️  Error al insertar item: {str(e)[:80]}")
-                
-                # Si llegamos aquí, el batch fue exitoso
-                return local_success, local_errors
-                
-            except ClientError as e:
-                error_code = e.response['Error']['Code']
-                
-                if error_code == 'ProvisionedThroughputExceededException':
-                    if attempt < max_retries - 1:
-                        # Backoff exponencial con jitter
-                        wait_time = (2 ** attempt) + random_module.uniform(0, 1)
-                        time.sleep(wait_time)
-                        # Resetear contadores para reintentar
-                        local_success = 0
-                        local_errors = 0
-                        continue
-                else:
-                    # Otro tipo de error
-                    local_errors += len(batch)
-                    return 0, local_errors
+        try:
+            # Serializar cada item una sola vez; uno no serializable se omite y
+            # cuenta como error sin afectar al resto del lote
+            requests = []
+            for item in batch:
+                try:
+                    requests.append({'PutRequest': {'Item': serialize_item(item)}})
+                except TypeError as e:
+                    print(f"      ⚠️  Item no serializable en '{table_name}', se omite: {str(e)[:120]}")
+            local_errors, throttled = len(batch) - len(requests), False
+            if requests:
+                pending, throttled = await send_write_requests(
+                    write_client, table_name, requests,
+                    on_throttle=lambda: register_throttle(launch_epoch)
+                )
+                local_errors += pending
+            local_success = len(batch) - local_errors
+        except Exception as e:
+            local_success, local_errors, throttled = 0, len(batch), False
+            print(f"      ⚠️  Error en lote: {str(e)[:80]}")
         
-        # Si se agotaron los reintentos
-        return local_success, local_errors
+        # Todas las tareas corren en el mismo event loop: no hace falta lock
+        success_count += local_success
+        error_count += local_errors
+        if not throttled:
+            register_success()
+    
+    async def progress_printer():
+        """Imprime el progreso periódicamente desde una sola tarea, leyendo los contadores"""
+        last_reported = (0, 0)
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL_SECONDS)
+            current = (success_count, error_count)
+            if current != last_reported:
+                porcentaje = ((success_count + error_count) / total_items) * 100
+                print(f"      📊 Progreso '{table_name}': {success_count}/{total_items} ({porcentaje:.1f}%) - Errores: {error_count}")
+                last_reported = current
+    
+    def valid_items(items):
+        """Omite (y cuenta como error) los items que DynamoDB rechazaría por tamaño"""
+        nonlocal error_count
+        for item in items:
+            item_size = estimate_item_size(item)
+            if item_size > MAX_ITEM_SIZE_BYTES:
+                error_count += 1
+                print(f"      ⚠️  Item de {item_size / 1024:.0f} KB supera el límite de 400 KB, se omite")
+                continue
+            yield item
+    
+    items = valid_items(items)
+    tasks = set()
+    progress_task = asyncio.create_task(progress_printer())
     
     try:
-        # Usar ThreadPoolExecutor para procesamiento paralelo
-        num_threads = min(10, len(batches))
-        
-        with ThreadPoolExecutor(max_workers=num_threads) as executor:
-            futures = {executor.submit(process_batch_with_retry, batch): batch for batch in batches}
+        while True:
+            # Esperar un hueco (según la concurrencia actual) antes de leer el siguiente lote
+            while len(tasks) >= current_concurrency:
+                _, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
             
-            for future in as_completed(futures):
-                try:
-                    local_success, local_errors = future.result()
-                    with count_lock:
-                        success_count += local_success
-                        error_count += local_errors
-                        
-                        # Mostrar progreso cada 5% o cada 500 items
-                        if (success_count % 500 == 0) or (success_count + error_count >= total_items):
-                            porcentaje = ((success_count + error_count) / total_items) * 100
-                            print(f"      📊 Progreso: {success_count}/{total_items} ({porcentaje:.1f}%) - Errores: {error_count}")
-                
-                except Exception as e:
-                    with count_lock:
-                        error_count += len(futures[future])
-                    print(f"      ⚠️  Error en lote: {str(e)[:80]}")
-        
-    except Exception as e:
-        print(f"   ❌ Error en procesamiento paralelo: {str(e)}")
-        return success_count, total_items - success_count
+            batch = list(islice(items, batch_size))
+            if not batch:
+                break
+            
+            tasks.add(asyncio.create_task(_write_batch(batch, decrease_epoch)))
+    finally:
+        # Esperar los lotes en vuelo aunque la lectura del archivo haya fallado
+        if tasks:
+            await asyncio.gather(*tasks)
+        progress_task.cancel()
     
     return success_count, error_count
 
@@ -361,8 +730,11 @@ def ask_user_action_global():
             print("   ⚠️  Opción inválida. Por favor selecciona 1 o 2")
 
 
-def populate_table(dynamodb, filename, table_config, global_action=None):
-    """Puebla una tabla de DynamoDB con datos de un archivo JSON"""
+async def populate_table(dynamodb, dynamodb_client, write_client, filename, table_config, existing_tables, global_action=None):
+    """
+    Puebla una tabla de DynamoDB con datos de un archivo JSON.
+    El archivo se carga en un thread mientras se verifica/limpia la tabla.
+    """
     table_name = table_config["table_name"]
     pk_name = table_config["pk"]
     sk_name = table_config["sk"]
@@ -371,59 +743,97 @@ def populate_table(dynamodb, filename, table_config, global_action=None):
     print(f"   Archivo: {filename}")
     print(f"   Claves: PK={pk_name}" + (f", SK={sk_name}" if sk_name else ""))
     
+    # Comprobar el archivo antes de tocar la tabla
+    filepath = os.path.join(DATA_DIR, filename)
+    if not os.path.isfile(filepath):
+        print(f"⚠️  Archivo no encontrado: {filepath}")
+        return False
+    
+    # Cargar datos del archivo en paralelo con la preparación de la tabla
+    load_task = asyncio.create_task(
+        asyncio.to_thread(load_json_file, filename, table_config["decimal_fields"])
+    )
+    
     # Verificar si la tabla existe, si no, crearla
-    if not table_exists(table_name):
-        if not create_table(table_name, pk_name, sk_name):
+    if table_name not in existing_tables:
+        if not await create_table(dynamodb, table_name, pk_name, sk_name):
             print(f"   ❌ No se pudo crear la tabla '{table_name}'. Saltando...")
+            load_task.cancel()
             return False
-        time.sleep(2)
+        await asyncio.sleep(2)
     else:
         print(f"   ✅ Tabla '{table_name}' existe")
         
         # Si hay una acción global definida y es "replace", limpiar la tabla
         if global_action == "replace":
-            # Verificar si la tabla tiene datos antes de limpiar
+            # Verificar si la tabla tiene datos antes de limpiar. Si no se puede
+            # verificar, se intenta limpiar igual: nunca se escribe sobre datos viejos
             try:
-                table = dynamodb.Table(table_name)
-                response = table.scan(Limit=1)
-                
-                if response.get('Count', 0) > 0:
-                    print(f"   🗑️  Limpiando datos existentes de '{table_name}'...")
-                    if not delete_all_items_from_table(table_name, pk_name, sk_name):
-                        print(f"   ❌ Error al limpiar la tabla. Saltando...")
-                        return False
-                else:
-                    print(f"   ℹ️  La tabla '{table_name}' está vacía")
+                response = await dynamodb_client.scan(TableName=table_name, Limit=1)
+                has_items = response.get('Count', 0) > 0
             except Exception as e:
                 print(f"   ⚠️  No se pudo verificar contenido de la tabla: {e}")
+                has_items = True
+            
+            if has_items:
+                print(f"   🗑️  Limpiando datos existentes de '{table_name}'...")
+                
+                # Recrear la tabla es más rápido que escanear y borrar item por item,
+                # salvo que tenga configuración que se perdería (o no se pueda revisar)
+                try:
+                    description = await dynamodb.meta.client.describe_table(TableName=table_name)
+                    table_description = description['Table']
+                    dependent_state = await get_dependent_state(dynamodb, table_description)
+                    tags = None if dependent_state else await get_table_tags(dynamodb, table_description['TableArn'])
+                except Exception as e:
+                    dependent_state = [f"configuración que no se pudo revisar ({str(e)[:80]})"]
+                
+                if dependent_state:
+                    print(f"   ℹ️  '{table_name}' tiene {', '.join(dependent_state)}: se borrarán sus items sin recrearla")
+                    cleared = await delete_all_items_from_table(dynamodb_client, write_client, table_name, pk_name, sk_name)
+                else:
+                    cleared = await recreate_table(dynamodb, table_description, tags)
+                    if cleared:
+                        await asyncio.sleep(2)
+                
+                if not cleared:
+                    print(f"   ❌ Error al limpiar la tabla '{table_name}'. Saltando...")
+                    load_task.cancel()
+                    return False
+            else:
+                print(f"   ℹ️  La tabla '{table_name}' está vacía")
         elif global_action == "append":
-            print(f"   ℹ️  Agregando datos a la tabla existente")
+            print(f"   ℹ️  Agregando datos a la tabla existente '{table_name}'")
     
-    # Cargar datos del archivo
-    items = load_json_file(filename)
+    items = await load_task
     
     if items is None:
         return False
     
     if not isinstance(items, list):
-        print(f"   ❌ El archivo debe contener un array JSON")
+        print(f"   ❌ El archivo {filename} debe contener un array JSON")
         return False
     
+    items, duplicates, invalid = dedupe_items(items, pk_name, sk_name)
+    if duplicates > 0:
+        print(f"   ⚠️  {duplicates} items con clave repetida en {filename} (se conserva el último)")
+    if invalid > 0:
+        print(f"   ❌ {invalid} items inválidos en {filename}: les falta la PK o la SK (se omiten)")
+    
     if len(items) == 0:
-        print(f"   ⚠️  El archivo está vacío, no hay datos para insertar")
-        return True
+        print(f"   ⚠️  El archivo {filename} no tiene items válidos para insertar")
+        return invalid == 0
     
-    print(f"   📊 Total de items a insertar: {len(items)}")
+    print(f"   📊 Total de items a insertar en '{table_name}': {len(items)}")
     
     try:
-        table = dynamodb.Table(table_name)
-        success_count, error_count = batch_write_items(table, items, table_name)
+        success_count, error_count = await batch_write_items(write_client, items, table_name, len(items))
         
-        print(f"   ✅ Insertados exitosamente: {success_count} items")
+        print(f"   ✅ Insertados exitosamente en '{table_name}': {success_count} items")
         if error_count > 0:
-            print(f"   ⚠️  Errores: {error_count} items")
+            print(f"   ⚠️  Errores en '{table_name}': {error_count} items")
         
-        return error_count == 0
+        return error_count == 0 and invalid == 0
         
     except ClientError as e:
         error_code = e.response['Error']['Code']
@@ -435,14 +845,17 @@ def populate_table(dynamodb, filename, table_config, global_action=None):
         return False
 
 
-def verify_credentials():
+async def verify_credentials(session):
     """
-    Verifica que las credenciales de AWS estén disponibles
+    Verifica que las credenciales de AWS estén disponibles en la sesión
     """
     try:
-        # Intentar obtener credenciales de la sesión de boto3
-        session = boto3.Session()
-        credentials = session.get_credentials()
+        # boto3 automáticamente busca credenciales en:
+        # 1. Variables de entorno
+        # 2. ~/.aws/credentials
+        # 3. ~/.aws/config
+        # Intentar obtener credenciales de la sesión (quedan resueltas para los clientes)
+        credentials = await session.get_credentials()
         
         if credentials is None:
             print("❌ ERROR: No se encontraron credenciales de AWS")
@@ -477,7 +890,7 @@ def verify_table_names():
     return True
 
 
-def main():
+async def main():
     """
     Función principal que ejecuta la población de todas las tablas
     """
@@ -486,7 +899,7 @@ def main():
     print("=" * 60)
 
     # Verificar credenciales
-    if not verify_credentials():
+    if not await verify_credentials(SESSION):
         return
 
     # Verificar nombres de tablas (las que vienen de JSON)
@@ -500,41 +913,65 @@ def main():
 
     # Conectar a DynamoDB
     print(f"\n🔌 Conectando a DynamoDB en región: {AWS_REGION}")
-    dynamodb = get_dynamodb_client()
-
-    if dynamodb is None:
-        print("❌ No se pudo establecer conexión con DynamoDB")
-        return
-
-    print("✅ Conexión establecida exitosamente")
-
-    # 👉 Crear/verificar tabla de tokens (SIN datos de JSON)
-    if TABLE_TOKENS:
-        print(f"\n📦 Verificando tabla de tokens: {TABLE_TOKENS}")
-        if not table_exists(TABLE_TOKENS):
-            created = create_table(
-                TABLE_TOKENS_CONFIG["table_name"],
-                TABLE_TOKENS_CONFIG["pk"],
-                TABLE_TOKENS_CONFIG["sk"]
-            )
-            if created:
-                print(f"   ✅ Tabla de tokens '{TABLE_TOKENS}' creada (vacía)")
-        else:
-            print(f"   ℹ️ Tabla de tokens '{TABLE_TOKENS}' ya existe")
-
-    # Preguntar acción global una sola vez (append / replace)
-    global_action = ask_user_action_global()
-
-    # Poblar cada tabla (Locales, Usuarios, Productos, etc.)
-    print("\n" + "=" * 60)
-    print("📊 INICIANDO POBLACIÓN DE TABLAS")
-    print("=" * 60)
-
-    results = {}
-    for filename, config in TABLE_MAPPING.items():
-        if config["table_name"]:
-            success = populate_table(dynamodb, filename, config, global_action)
-            results[filename] = success
+    async with SESSION.resource('dynamodb', config=BOTO_CONFIG) as dynamodb, \
+            SESSION.client('dynamodb', config=BOTO_CONFIG) as dynamodb_client, \
+            SESSION.client('dynamodb', config=WRITE_BOTO_CONFIG) as write_client:
+        # Obtener de una vez las tablas existentes (valida también la conexión)
+        existing_tables = await list_existing_tables(dynamodb_client)
+
+        if existing_tables is None:
+            print("❌ No se pudo establecer conexión con DynamoDB")
+            return
+
+        print("✅ Conexión establecida exitosamente")
+
+        # 👉 Crear/verificar tabla de tokens (SIN datos de JSON)
+        if TABLE_TOKENS:
+            print(f"\n📦 Verificando tabla de tokens: {TABLE_TOKENS}")
+            if TABLE_TOKENS not in existing_tables:
+                created = await create_table(
+                    dynamodb,
+                    TABLE_TOKENS_CONFIG["table_name"],
+                    TABLE_TOKENS_CONFIG["pk"],
+                    TABLE_TOKENS_CONFIG["sk"]
+                )
+                if created:
+                    print(f"   ✅ Tabla de tokens '{TABLE_TOKENS}' creada (vacía)")
+            else:
+                print(f"   ℹ️ Tabla de tokens '{TABLE_TOKENS}' ya existe")
+
+        # Preguntar acción global una sola vez (append / replace)
+        global_action = ask_user_action_global()
+
+        # Poblar todas las tablas (Locales, Usuarios, Productos, etc.) en paralelo:
+        # son independientes, así que sus borrados y escrituras se solapan
+        print("\n" + "=" * 60)
+        print("📊 INICIANDO POBLACIÓN DE TABLAS")
+        print("=" * 60)
+
+        # Las tablas más grandes (pedidos, reseñas...) se lanzan primero para que
+        # no queden rezagadas al final (largest-first minimiza el tiempo total)
+        pending_tables = sorted(
+            (
+                (filename, config) for filename, config in TABLE_MAPPING.items()
+                if config["table_name"]
+            ),
+            key=lambda entry: get_data_file_size(entry[0]),
+            reverse=True
+        )
+        # return_exceptions: un error inesperado en una tabla no aborta las demás
+        # (ni cierra los clientes con escrituras en vuelo); se cuenta como fallida
+        outcomes = await asyncio.gather(*[
+            populate_table(dynamodb, dynamodb_client, write_client, filename, config, existing_tables, global_action)
+            for filename, config in pending_tables
+        ], return_exceptions=True)
+
+        results = {}
+        for (filename, config), outcome in zip(pending_tables, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"   ❌ Error inesperado en '{config['table_name']}': {outcome}")
+                outcome = False
+            results[filename] = outcome
 
     # Resumen final
     print("\n" + "=" * 60)
@@ -553,4 +990,4 @@ def main():
     print("=" * 60)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())